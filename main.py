@@ -1,9 +1,9 @@
 import sys
 import os
 import pandas as pd
-from plotters import plot_elo_trend, plot_radar_chart, plot_all_radars
+from plotters import load_elo_outputs, plot_elo_trend, plot_elo_trends_parallel, plot_radar_chart, plot_all_radars
 from team_analyzer import analyze_all_teams, forecast_all_matches
-from player_analyzer import save_top_players_to_csv
+from player_analyzer import POSITION_SCHEMA, load_players, save_top_players_to_csv
 
 # 20 Premier League teams (in alphabetical order)
 teams = [
@@ -14,33 +14,8 @@ teams = [
     "West Ham United FC", "Wolverhampton Wanderers FC"
 ]
 
-# Player position mapping
-position_map = {
-    "1": {
-        "name": "Forward",
-        "file": "top_fw_players.csv",
-        "metrics": [
-            "g_minus_pkgls_per90_norm", "xggls_per90_norm", "xaggls_per90_norm",
-            "take_ons_succ_pct_norm", "carries_prgc_norm", "receiving_prgr_norm"
-        ]
-    },
-    "2": {
-        "name": "Midfielder",
-        "file": "top_mf_players.csv",
-        "metrics": [
-            "progression_prgp_norm", "progression_prgr_norm", "xaggls_per90_norm",
-            "sca_sca90_norm", "touches_mid_3rd_norm", "performance_int_norm"
-        ]
-    },
-    "3": {
-        "name": "Defender",
-        "file": "top_df_players.csv",
-        "metrics": [
-            "performance_tklw_norm", "performance_int_norm", "blocks_blocks_norm",
-            "aerialduels_won_pct_norm", "progression_prgp_norm", "err_norm"
-        ]
-    }
-}
+# Player position mapping (menu number -> position schema entry)
+position_map = {str(idx): spec for idx, spec in enumerate(POSITION_SCHEMA.values(), 1)}
 
 # -------------------- Auto Generation Section --------------------
 
@@ -51,13 +26,14 @@ def prepare_elo():
 
     if not os.path.exists(matches_path) or not os.path.exists(schedule_path):
         print("❌ Missing raw data files required for Elo computation.")
-        return
+        return None, None
 
     matches_df = pd.read_csv(matches_path)
     schedule_df = pd.read_csv(schedule_path)
     elo_history_df = analyze_all_teams(matches_df)
-    forecast_all_matches(schedule_df, elo_history_df)
+    forecast_df = forecast_all_matches(schedule_df, elo_history_df)
     print("✔ Elo data successfully generated.")
+    return elo_history_df, forecast_df
 
 def prepare_players():
     print("\n🧠 Ranking TOP 3 players (FW/MF/DF)...")
@@ -66,12 +42,12 @@ def prepare_players():
         print("❌ Missing raw player data for scoring.")
         return
 
-    df = pd.read_csv(raw_path)
+    df = load_players(raw_path)
     save_top_players_to_csv(df)
     print("✔ Player ranking files successfully generated.")
 
 # -------------------- Interactive Section --------------------
-def choose_team():
+def choose_team(elo_df: pd.DataFrame = None, forecast_df: pd.DataFrame = None):
     print("\nSelect a team to view Elo trend chart (or 0 to skip, 21 for all teams):")
     for idx, team in enumerate(teams, 1):
         print(f"{idx:>2}. {team}")
@@ -83,12 +59,16 @@ def choose_team():
         print("⏭ Skipped team chart generation.")
         return
     elif choice == "21":
-        for team_name in teams:
-            plot_elo_trend(team_name)
+        # Reuse the in-memory results when available; read the CSVs only as a fallback
+        if elo_df is None or forecast_df is None:
+            elo_df, forecast_df = load_elo_outputs()
+            if elo_df is None:
+                return
+        plot_elo_trends_parallel(teams, elo_df, forecast_df)
         return
     elif choice.isdigit() and 1 <= int(choice) <= 20:
         team_name = teams[int(choice) - 1]
-        plot_elo_trend(team_name)
+        plot_elo_trend(team_name, elo_df, forecast_df)
     else:
         print("❌ Invalid selection. Exiting program.")
         sys.exit(1)
@@ -96,18 +76,18 @@ def choose_team():
 def choose_position():
     print("\nSelect a player position to generate radar chart:")
     print("0. Skip radar chart generation.")
-    print("1. Forward")
-    print("2. Midfielder")
-    print("3. Defender")
-    print("4. Generate all radar charts")
-    choice = input("Enter number (0–4): ").strip()
+    for key, info in position_map.items():
+        print(f"{key}. {info['name']}")
+    all_choice = str(len(position_map) + 1)
+    print(f"{all_choice}. Generate all radar charts")
+    choice = input(f"Enter number (0–{all_choice}): ").strip()
 
     if choice in position_map:
         info = position_map[choice]
-        plot_radar_chart(info["file"], info["name"], info["metrics"])
+        plot_radar_chart(info["top_file"], info["name"], info["metrics"])
     elif choice == "0":
         print("⏭ Skipping radar chart generation.")
-    elif choice == "4":
+    elif choice == all_choice:
         plot_all_radars()
     else:
         print("❌ Invalid selection. Exiting program.")
@@ -117,8 +97,8 @@ def choose_position():
 if __name__ == "__main__":
     print("⚽ Welcome to EPL Metrics Lab ⚽")
 
-    prepare_elo()
+    elo_df, forecast_df = prepare_elo()
     prepare_players()
 
-    choose_team()
+    choose_team(elo_df, forecast_df)
     choose_position()
\ No newline at end of file
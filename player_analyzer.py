@@ -3,9 +3,16 @@ import pandas as pd
 import numpy as np
 import os
 
+try:
+    import pyarrow.csv as pacsv
+except ImportError:  # pyarrow is optional; fall back to the pandas C parser
+    pacsv = None
+
 os.makedirs("outputs", exist_ok=True)
 
 class TopPlayerFinder(ABC):
+    columns_to_scale: list = []  # Raw metric columns each scorer normalizes
+
     def __init__(self, df: pd.DataFrame):
         self.df = df
         self.filtered_df = None
@@ -13,11 +20,11 @@ class TopPlayerFinder(ABC):
     def filter_by_minutes(self, df: pd.DataFrame, minute_column: str = 'playing_time_min') -> pd.DataFrame:
         """Filter out players who played less than the median playing time."""
         threshold = df[minute_column].median()
-        return df[df[minute_column] >= threshold].copy()
+        return df[df[minute_column] >= threshold]
 
-    @abstractmethod
-    def filter_players(self): # Filter players by position
-        pass
+    def filter_players(self):
+        """Filter players within the position group passed to the scorer."""
+        self.filtered_df = self.filter_by_minutes(self.df)
 
     @abstractmethod
     def prepare_features(self): # Select fields and standardize
@@ -27,14 +34,38 @@ class TopPlayerFinder(ABC):
     def compute_score(self): # Assign weights and calculate total score
         pass
 
-    def normalize(self, series: pd.Series) -> pd.Series:
-        """Min-max normalization."""
-        return (series - series.min()) / (series.max() - series.min())
+    def normalize(self, values):
+        """Min-max normalization. 2-D arrays are normalized per column; a Series comes back as a Series."""
+        arr = self._as_float(values)
+        if arr.size == 0:
+            normed = arr.copy()  # nanmin/nanmax have no identity for empty input (e.g. no players)
+        else:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                col_min = np.nanmin(arr, axis=0)
+                normed = (arr - col_min) / (np.nanmax(arr, axis=0) - col_min)
+        if isinstance(values, pd.Series):
+            return pd.Series(normed, index=values.index, name=values.name)
+        return normed
+
+    def log_scaling(self, values):
+        """Apply log transformation to reduce the impact of outliers. A Series comes back as a Series."""
+        normed = self.normalize(self._log1p_clipped(self._as_float(values)))
+        if isinstance(values, pd.Series):
+            return pd.Series(normed, index=values.index, name=values.name)
+        return normed
+
+    @staticmethod
+    def _as_float(values) -> np.ndarray:
+        """NumPy view of values, keeping float32/float64 as is and casting anything else to float64."""
+        arr = np.asarray(values)
+        if not np.issubdtype(arr.dtype, np.floating):
+            arr = arr.astype(np.float64)
+        return arr
 
-    def log_scaling(self, series: pd.Series) -> pd.Series:
-        """Apply log transformation to reduce the impact of outliers."""
-        series = series.clip(lower=0).fillna(0)
-        return self.normalize(np.log1p(series))
+    @staticmethod
+    def _log1p_clipped(arr: np.ndarray) -> np.ndarray:
+        """log1p of values clipped at 0; np.fmax also maps NaN to 0 in the same call."""
+        return np.log1p(np.fmax(arr, 0))
 
     def smart_scale(self, df: pd.DataFrame, column: str, factor: float = 1.5) -> pd.DataFrame:
         """
@@ -51,21 +82,48 @@ class TopPlayerFinder(ABC):
         has_outlier = ((df[column] < lower) | (df[column] > upper)).any()
 
         if has_outlier:
-            df[f'{column}_norm'] = self.log_scaling(df[column])
+            scaled = self.log_scaling(df[column])
         else:
-            df[f'{column}_norm'] = self.normalize(df[column])
-        return df
+            scaled = self.normalize(df[column])
+        # assign() returns a new frame, so filtered slices are never written to
+        return df.assign(**{f'{column}_norm': scaled})
+
+    def smart_scale_many(self, df: pd.DataFrame, columns: list, factor: float = 1.5) -> pd.DataFrame:
+        """
+        Apply smart_scale to several columns at once.
+
+        Quartiles, outlier masks and both scalings are computed for all columns in one pass,
+        then the '_norm' columns are attached as a single block.
+        """
+        q = df[columns].quantile([0.25, 0.75]).to_numpy()
+        iqr = q[1] - q[0]
+        lower = q[0] - factor * iqr
+        upper = q[1] + factor * iqr
+
+        arr = self._as_float(df[columns].to_numpy())
+        has_outlier = ((arr < lower) | (arr > upper)).any(axis=0)
+
+        log_cols = self._log1p_clipped(arr)
+        normed = self.normalize(np.where(has_outlier, log_cols, arr))
+
+        norm_df = pd.DataFrame(normed, index=df.index, columns=[f'{column}_norm' for column in columns])
+        return pd.concat([df, norm_df], axis=1, copy=False)
 
     def compute_weighted_score(self, df: pd.DataFrame, weights: dict) -> pd.DataFrame:
         """Compute weighted total score from normalized metrics."""
-        df['score'] = 0
-        for col, weight in weights.items():
-            df['score'] += df[col] * weight
-        return df
+        columns = list(weights)
+        metrics = self._as_float(df[columns].to_numpy())
+        weight_vector = np.fromiter(weights.values(), dtype=metrics.dtype, count=len(weights))
+        return df.assign(score=metrics @ weight_vector)
 
     def top_n(self, n: int) -> pd.DataFrame:
         """Return top N players based on score."""
-        return self.filtered_df.sort_values(by='score', ascending=False).head(n)
+        scores = self.filtered_df['score'].to_numpy()
+        if n <= 0 or n >= len(scores):
+            return self.filtered_df.sort_values(by='score', ascending=False).head(n)
+        # Partial selection of the N best, then sort only those
+        top_idx = np.argpartition(-scores, n - 1)[:n]
+        return self.filtered_df.iloc[top_idx].sort_values(by='score', ascending=False)
 
     def get_all_ranked(self, columns: list) -> pd.DataFrame:
         """Return all ranked players with selected columns, including 1-based rank."""
@@ -75,22 +133,17 @@ class TopPlayerFinder(ABC):
 
 # ---------------- Forward Scorer ----------------
 class ForwardScorer(TopPlayerFinder):
-    def filter_players(self):
-        fw_df = self.df[self.df['main_pos'] == 'FW'].copy()
-        fw_df = self.filter_by_minutes(fw_df)
-        self.filtered_df = fw_df
+    columns_to_scale = [
+        'gls_per90', 'g_minus_pkgls_per90', 'g_plus_agls_per90',
+        'g_plus_a_minus_pkgls_per90', 'xggls_per90', 'xg_plus_xaggls_per90',
+        'npxggls_per90', 'astgls_per90', 'xaggls_per90', 'sca_sca90',
+        'take_ons_succ_pct', 'carries_prgdist', 'carries_prgc',
+        'receiving_prgr', 'performance_off', 'teamsuccess_plus_minus90'
+    ]
 
     def prepare_features(self):
         fw_df = self.filtered_df
-        columns_to_scale = [
-            'gls_per90', 'g_minus_pkgls_per90', 'g_plus_agls_per90',
-            'g_plus_a_minus_pkgls_per90', 'xggls_per90', 'xg_plus_xaggls_per90',
-            'npxggls_per90', 'astgls_per90', 'xaggls_per90', 'sca_sca90',
-            'take_ons_succ_pct', 'carries_prgdist', 'carries_prgc',
-            'receiving_prgr', 'performance_off', 'teamsuccess_plus_minus90'
-        ]
-        for col in columns_to_scale:
-            fw_df = self.smart_scale(fw_df, col)
+        fw_df = self.smart_scale_many(fw_df, self.columns_to_scale)
         self.filtered_df = fw_df
 
     def compute_score(self):
@@ -116,22 +169,17 @@ class ForwardScorer(TopPlayerFinder):
 
 # ---------------- Midfielder Scorer ----------------
 class MidfielderScorer(TopPlayerFinder):
-    def filter_players(self):
-        mf_df = self.df[self.df['main_pos'] == 'MF'].copy()
-        mf_df = self.filter_by_minutes(mf_df)
-        self.filtered_df = mf_df
+    columns_to_scale = [
+        'progression_prgp', 'progression_prgr', 'progression_prgc',
+        'pass_types_live', 'carries_prgdist', 'xaggls_per90', 'astgls_per90',
+        'sca_sca90', 'xg_plus_xaggls_per90', 'g_plus_agls_per90',
+        'take_ons_succ_pct', 'receiving_prgr', 'touches_mid_3rd',
+        'performance_int', 'teamsuccess_plus_minus90'
+    ]
 
     def prepare_features(self):
         mf_df = self.filtered_df
-        columns_to_scale = [
-            'progression_prgp', 'progression_prgr', 'progression_prgc',
-            'pass_types_live', 'carries_prgdist', 'xaggls_per90', 'astgls_per90',
-            'sca_sca90', 'xg_plus_xaggls_per90', 'g_plus_agls_per90',
-            'take_ons_succ_pct', 'receiving_prgr', 'touches_mid_3rd',
-            'performance_int', 'teamsuccess_plus_minus90'
-        ]
-        for col in columns_to_scale:
-            mf_df = self.smart_scale(mf_df, col)
+        mf_df = self.smart_scale_many(mf_df, self.columns_to_scale)
         self.filtered_df = mf_df
 
     def compute_score(self):
@@ -156,22 +204,17 @@ class MidfielderScorer(TopPlayerFinder):
 
 # ---------------- Defender Scorer ----------------
 class DefenderScorer(TopPlayerFinder):
-    def filter_players(self):
-        df = self.df[self.df['main_pos'] == 'DF'].copy()
-        df = self.filter_by_minutes(df)
-        self.filtered_df = df
+    columns_to_scale = [
+        'performance_int', 'performance_tklw', 'blocks_blocks',
+        'aerialduels_won_pct', 'progression_prgp', 'progression_prgr', 'progression_prgc',
+        'pass_types_live', 'touches_def_3rd', 'receiving_prgr', 'teamsuccess_plus_minus90',
+        'take_ons_succ_pct', 'carries_prgdist', 'performance_crdy', 'performance_crdr',
+        'err'
+    ]
 
     def prepare_features(self):
         df = self.filtered_df
-        columns_to_scale = [
-            'performance_int', 'performance_tklw', 'blocks_blocks',
-            'aerialduels_won_pct', 'progression_prgp', 'progression_prgr', 'progression_prgc',
-            'pass_types_live', 'touches_def_3rd', 'receiving_prgr', 'teamsuccess_plus_minus90',
-            'take_ons_succ_pct', 'carries_prgdist', 'performance_crdy', 'performance_crdr',
-            'err'
-        ]
-        for col in columns_to_scale:
-            df = self.smart_scale(df, col)
+        df = self.smart_scale_many(df, self.columns_to_scale)
         self.filtered_df = df
 
     def compute_score(self):
@@ -195,51 +238,79 @@ class DefenderScorer(TopPlayerFinder):
         }
         self.filtered_df = self.compute_weighted_score(self.filtered_df, weights)
 
+# ---------------- Position Schema ----------------
+# Single source for each position's scorer, output file and the metrics shown in rankings and radar charts
+POSITION_SCHEMA = {
+    'FW': {
+        'name': 'Forward',
+        'scorer_cls': ForwardScorer,
+        'top_file': 'all_fw_players.csv',
+        'metrics': [
+            'g_minus_pkgls_per90_norm',
+            'xggls_per90_norm',
+            'xaggls_per90_norm',
+            'take_ons_succ_pct_norm',
+            'carries_prgc_norm',
+            'receiving_prgr_norm'
+        ]
+    },
+    'MF': {
+        'name': 'Midfielder',
+        'scorer_cls': MidfielderScorer,
+        'top_file': 'all_mf_players.csv',
+        'metrics': [
+            'progression_prgp_norm',
+            'progression_prgr_norm',
+            'xaggls_per90_norm',
+            'sca_sca90_norm',
+            'touches_mid_3rd_norm',
+            'performance_int_norm'
+        ]
+    },
+    'DF': {
+        'name': 'Defender',
+        'scorer_cls': DefenderScorer,
+        'top_file': 'all_df_players.csv',
+        'metrics': [
+            'performance_tklw_norm',
+            'performance_int_norm',
+            'blocks_blocks_norm',
+            'aerialduels_won_pct_norm',
+            'progression_prgp_norm',
+            'err_norm'
+        ]
+    }
+}
+
+# ---------------- Load Player Data ----------------
+def load_players(path: str) -> pd.DataFrame:
+    """Read only the columns used by the scorers from the merged player CSV."""
+    text_cols = ['player', 'main_pos']
+    needed_cols = text_cols + ['playing_time_min']
+    for spec in POSITION_SCHEMA.values():
+        needed_cols += [col for col in spec['scorer_cls'].columns_to_scale if col not in needed_cols]
+
+    if pacsv is not None:
+        convert_options = pacsv.ConvertOptions(include_columns=needed_cols, strings_can_be_null=True)
+        df = pacsv.read_csv(path, convert_options=convert_options).to_pandas()
+    else:
+        df = pd.read_csv(path, usecols=needed_cols)[needed_cols]
+
+    # Metrics are bounded values; float32 is precise enough and halves memory traffic
+    numeric_cols = [col for col in needed_cols if col not in text_cols]
+    df[numeric_cols] = df[numeric_cols].astype(np.float32)
+    return df
+
 # ---------------- Save to CSV ----------------
 def save_top_players_to_csv(df: pd.DataFrame, output_dir: str = "outputs"):
     """Run scorer pipelines and save full rankings for FW, MF, DF to CSV."""
+    # Partition by position once; each scorer receives only its own group
+    groups = {pos: group for pos, group in df.groupby('main_pos', sort=False)}
 
-    fw = ForwardScorer(df)
-    fw.filter_players()
-    fw.prepare_features()
-    fw.compute_score()
-    fw_all = fw.get_all_ranked([
-        "player", "score",
-        "g_minus_pkgls_per90_norm",
-        "xggls_per90_norm",
-        "xaggls_per90_norm",
-        "take_ons_succ_pct_norm",
-        "carries_prgc_norm",
-        "receiving_prgr_norm"
-    ])
-    fw_all.to_csv(os.path.join(output_dir, "all_fw_players.csv"), index=False)
-
-    mf = MidfielderScorer(df)
-    mf.filter_players()
-    mf.prepare_features()
-    mf.compute_score()
-    mf_all = mf.get_all_ranked([
-        "player", "score",
-        "progression_prgp_norm",
-        "progression_prgr_norm",
-        "xaggls_per90_norm",
-        "sca_sca90_norm",
-        "touches_mid_3rd_norm",
-        "performance_int_norm"
-    ])
-    mf_all.to_csv(os.path.join(output_dir, "all_mf_players.csv"), index=False)
-
-    df_sc = DefenderScorer(df)
-    df_sc.filter_players()
-    df_sc.prepare_features()
-    df_sc.compute_score()
-    df_all = df_sc.get_all_ranked([
-        "player", "score",
-        "performance_tklw_norm",
-        "performance_int_norm",
-        "blocks_blocks_norm",
-        "aerialduels_won_pct_norm",
-        "progression_prgp_norm",
-        "err_norm"
-    ])
-    df_all.to_csv(os.path.join(output_dir, "all_df_players.csv"), index=False)
\ No newline at end of file
+    for pos, spec in POSITION_SCHEMA.items():
+        scorer = spec['scorer_cls'](groups.get(pos, df.iloc[:0]))
+        scorer.filter_players()
+        scorer.prepare_features()
+        scorer.compute_score()
+        ranked = scorer.get_all_ranked(["player", "score"] + spec['metrics'])
+        ranked.to_csv(os.path.join(output_dir, spec['top_file']), index=False)
@@ -1,38 +1,49 @@
 import pandas as pd
+import matplotlib
+matplotlib.use("Agg")  # charts are only saved to file; also safe inside worker processes
 import matplotlib.pyplot as plt
 import numpy as np
 import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from math import pi
+from functools import lru_cache
 from config import FIGURE_DPI, FIGURE_STYLE, FONT_FAMILY
+from player_analyzer import POSITION_SCHEMA
 
 os.makedirs("outputs", exist_ok=True)
-plt.style.use(FIGURE_STYLE)
-plt.rcParams["font.family"] = FONT_FAMILY
 
-# ---------------- Elo History + Trend Line + Forecast Text ----------------
-def plot_elo_trend(team_name: str):
-    # Teams relegated at the end of the 2024/25 Premier League season.
-    relegated_teams = {
-        "Leicester City FC",
-        "Ipswich Town FC",
-        "Southampton FC"
-    }
+# Teams relegated at the end of the 2024/25 Premier League season.
+RELEGATED_TEAMS = {
+    "Leicester City FC",
+    "Ipswich Town FC",
+    "Southampton FC"
+}
+
+_style_applied = False
 
+def apply_plot_style():
+    """Apply the project's matplotlib style once per process."""
+    global _style_applied
+    if not _style_applied:
+        plt.style.use(FIGURE_STYLE)
+        plt.rcParams["font.family"] = FONT_FAMILY
+        _style_applied = True
+
+# ---------------- Elo History + Trend Line + Forecast Text ----------------
+def load_elo_outputs():
+    """Read the Elo history and forecast CSVs once; returns (None, None) if they are missing."""
     try:
         elo_df = pd.read_csv("outputs/elo_history_all.csv")
         forecast_df = pd.read_csv("outputs/win_probability_forecast.csv")
     except FileNotFoundError:
         print("❌ Required data files not found in 'outputs/' directory.")
-        return
-
-    team_elo = elo_df[elo_df["team"] == team_name]
-    if team_elo.empty:
-        print(f"❌ No Elo data found for '{team_name}'. Please check the team name.")
-        return
+        return None, None
+    return elo_df, forecast_df
 
-    forecast_team = forecast_df[forecast_df["team"] == team_name]
-
-    fig, ax = plt.subplots(figsize=(10, 5))
+def _draw_elo_trend(ax, team_name: str, team_elo: pd.DataFrame, forecast_team: pd.DataFrame) -> str:
+    """Draw one team's Elo line and trend on ax; returns the forecast text for the figure footer."""
     ax.plot(team_elo["round"], team_elo["elo_score"], marker="o", color="darkblue", linewidth=2, label=team_name)
 
     # Add trend line
@@ -48,7 +59,7 @@ def plot_elo_trend(team_name: str):
 
     # Build forecast text, including relegation note if needed
     forecast_lines = ["Win Probability Forecast — Rounds 1 & 2 of the 2025/26 Season", ""]
-    if team_name in relegated_teams:
+    if team_name in RELEGATED_TEAMS:
         forecast_lines.append(f"{team_name} was relegated to the Championship after the 2024/25 season.")
         forecast_lines.append("")
 
@@ -64,19 +75,92 @@ def plot_elo_trend(team_name: str):
             f"{date} Round {rnd} — {home} (Home): {home_prob} vs {away} (Away): {away_prob}"
         )
 
-    forecast_text = "\n".join(forecast_lines)
-    plt.figtext(
+    return "\n".join(forecast_lines)
+
+def _elo_trend_path(team_name: str) -> str:
+    return os.path.join("outputs", f"{team_name.replace(' ', '_')}_elo_trend.png")
+
+def plot_elo_trend(team_name: str, elo_df: pd.DataFrame = None, forecast_df: pd.DataFrame = None,
+                   dpi: int = FIGURE_DPI):
+    # Only hit the disk when the caller has not already loaded the data
+    if elo_df is None or forecast_df is None:
+        elo_df, forecast_df = load_elo_outputs()
+        if elo_df is None:
+            return
+
+    team_elo = elo_df[elo_df["team"] == team_name]
+    if team_elo.empty:
+        print(f"❌ No Elo data found for '{team_name}'. Please check the team name.")
+        return
+
+    forecast_team = forecast_df[forecast_df["team"] == team_name]
+
+    apply_plot_style()
+    fig, ax = plt.subplots(figsize=(10, 5))
+    forecast_text = _draw_elo_trend(ax, team_name, team_elo, forecast_team)
+    fig.text(
         0.5, -0.1,
         forecast_text,
         ha="center", fontsize=11, color="#6A5ACD", wrap=True
     )
 
-    output_path = os.path.join("outputs", f"{team_name.replace(' ', '_')}_elo_trend.png")
+    output_path = _elo_trend_path(team_name)
     fig.tight_layout(pad=3.0)
-    plt.savefig(output_path, dpi=FIGURE_DPI, bbox_inches="tight")
-    plt.close()
+    fig.savefig(output_path, dpi=dpi, bbox_inches="tight")
+    plt.close(fig)
     print(f"✔ Elo trend plot saved to {output_path}")
 
+def plot_elo_trend_batch(team_names: list, elo_df: pd.DataFrame, forecast_df: pd.DataFrame,
+                         dpi: int = FIGURE_DPI):
+    """Plot Elo trends for several teams, reusing a single figure instead of building one per team."""
+    apply_plot_style()
+    fig, ax = plt.subplots(figsize=(10, 5))
+    footer = fig.text(0.5, -0.1, "", ha="center", fontsize=11, color="#6A5ACD", wrap=True)
+
+    for team_name in team_names:
+        team_elo = elo_df[elo_df["team"] == team_name]
+        if team_elo.empty:
+            print(f"❌ No Elo data found for '{team_name}'. Please check the team name.")
+            continue
+
+        forecast_team = forecast_df[forecast_df["team"] == team_name]
+
+        ax.clear()
+        footer.set_text(_draw_elo_trend(ax, team_name, team_elo, forecast_team))
+
+        output_path = _elo_trend_path(team_name)
+        fig.tight_layout(pad=3.0)
+        fig.savefig(output_path, dpi=dpi, bbox_inches="tight")
+        print(f"✔ Elo trend plot saved to {output_path}")
+
+    plt.close(fig)
+
+# Frames shared with worker processes through the pool initializer
+_worker_elo_df = None
+_worker_forecast_df = None
+
+def _init_plot_worker(elo_df: pd.DataFrame, forecast_df: pd.DataFrame):
+    global _worker_elo_df, _worker_forecast_df
+    _worker_elo_df = elo_df
+    _worker_forecast_df = forecast_df
+
+def _plot_team_chunk(team_names: list, dpi: int):
+    plot_elo_trend_batch(team_names, _worker_elo_df, _worker_forecast_df, dpi)
+
+def plot_elo_trends_parallel(team_names: list, elo_df: pd.DataFrame, forecast_df: pd.DataFrame,
+                             dpi: int = FIGURE_DPI, max_workers: int = None):
+    """Render Elo trend charts across processes; each worker plots its share of teams on one figure."""
+    max_workers = min(max_workers or os.cpu_count() or 1, len(team_names))
+    if max_workers <= 1:
+        plot_elo_trend_batch(team_names, elo_df, forecast_df, dpi)
+        return
+
+    chunks = [team_names[i::max_workers] for i in range(max_workers)]
+    # spawn: the parent may already run native threads (e.g. pyarrow's CSV reader), which fork can deadlock on
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_plot_worker, initargs=(elo_df, forecast_df)) as executor:
+        list(executor.map(_plot_team_chunk, chunks, repeat(dpi)))
+
 # -------------------- Radar Chart --------------------
 def radar_factory(num_vars):
     angles = np.linspace(0, 2 * np.pi, num_vars, endpoint=False).tolist()
@@ -104,6 +188,13 @@ readable_names = {
     "err_norm": "No Errors"
 }
 
+@lru_cache(maxsize=None)
+def _radar_setup(metrics: tuple):
+    """Angles and axis labels depend only on the metric list, so compute them once per list."""
+    angles = tuple(radar_factory(len(metrics)))
+    label_names = tuple(readable_names.get(m, m) for m in metrics)
+    return angles, label_names
+
 def plot_radar_chart(csv_filename, position_name, metrics):
     path = os.path.join("outputs", csv_filename)
     if not os.path.exists(path):
@@ -112,18 +203,21 @@ def plot_radar_chart(csv_filename, position_name, metrics):
 
     try:
         df = pd.read_csv(path).head(3) # in case future files contain more
-        angles = radar_factory(len(metrics))
+        angles, label_names = _radar_setup(tuple(metrics))
 
+        # One row per player, closed back onto the first metric
+        values = df[metrics].to_numpy()
+        values = np.hstack([values, values[:, :1]])
+        labels = [f"TOP {idx+1} {player}" for idx, player in enumerate(df["player"])]
+
+        apply_plot_style()
         fig, ax = plt.subplots(figsize=(8, 8), subplot_kw=dict(polar=True))
         ax.set_position([0.1, 0.05, 0.7, 0.7])
 
-        for idx, (_, row) in enumerate(df.iterrows()):
-            values = [row[m] for m in metrics]
-            values += values[:1]
-            ax.plot(angles, values, label=f"TOP {idx+1} {row['player']}")
-            ax.fill(angles, values, alpha=0.1)
+        lines = ax.plot(angles, values.T, label=labels)
+        for line, player_values in zip(lines, values):
+            ax.fill(angles, player_values, color=line.get_color(), alpha=0.1)
 
-        label_names = [readable_names.get(m, m) for m in metrics]
         ax.set_xticks(angles[:-1])
         ax.set_xticklabels(label_names, fontsize=10)
 
@@ -141,41 +235,5 @@ def plot_radar_chart(csv_filename, position_name, metrics):
         print(f"❌ Failed to plot radar chart for {position_name}: {e}")
 
 def plot_all_radars():
-    plot_radar_chart(
-        "all_fw_players.csv",
-        "Forward",
-        [
-            "g_minus_pkgls_per90_norm",
-            "xggls_per90_norm",
-            "xaggls_per90_norm",
-            "take_ons_succ_pct_norm",
-            "carries_prgc_norm",
-            "receiving_prgr_norm"
-        ]
-    )
-
-    plot_radar_chart(
-        "all_mf_players.csv",
-        "Midfielder",
-        [
-            "progression_prgp_norm",
-            "progression_prgr_norm",
-            "xaggls_per90_norm",
-            "sca_sca90_norm",
-            "touches_mid_3rd_norm",
-            "performance_int_norm"
-        ]
-    )
-
-    plot_radar_chart(
-        "all_df_players.csv",
-        "Defender",
-        [
-            "performance_tklw_norm",
-            "performance_int_norm",
-            "blocks_blocks_norm",
-            "aerialduels_won_pct_norm",
-            "progression_prgp_norm",
-            "err_norm"
-        ]
-    )
\ No newline at end of file
+    for spec in POSITION_SCHEMA.values():
+        plot_radar_chart(spec["top_file"], spec["name"], spec["metrics"])
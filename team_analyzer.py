@@ -1,70 +1,52 @@
 import pandas as pd
+import numpy as np
 import os
-from config import INITIAL_ELO, HOME_ADVANTAGE
-from utils import update_elo, win_probability
+from config import INITIAL_ELO, HOME_ADVANTAGE, ELO_K_FACTOR, ELO_SCALING
+from utils import win_probability
+from utils_numba import match_results, run_elo
 
 os.makedirs("outputs", exist_ok=True)
 
-# ------------- Elo analysis for a single team --------------
-def analyze_team(team_df: pd.DataFrame, team_name: str) -> pd.DataFrame:
-    mask = (team_df['home_team'] == team_name) | (team_df['away_team'] == team_name)
-    target_team = team_df[mask].copy()
-    target_team.sort_values(by='round', inplace=True)
-
-    team_elos = {}
-    elo_history = []
-
-    for _, row in target_team.iterrows():
-        home = row['home_team']
-        away = row['away_team']
-        home_score = row['home_score']
-        away_score = row['away_score']
-        round_num = row['round']
-
-        # Initialize Elo
-        if home not in team_elos:
-            team_elos[home] = INITIAL_ELO
-        if away not in team_elos:
-            team_elos[away] = INITIAL_ELO
-
-        # Add home advantage
-        home_elo = team_elos[home] + HOME_ADVANTAGE
-        away_elo = team_elos[away]
-
-        # Compute match result
-        if home_score > away_score:
-            result = 1
-        elif home_score == away_score:
-            result = 0.5
-        else:
-            result = 0
-
-        # Update Elo ratings
-        new_home_elo, new_away_elo = update_elo(home_elo, away_elo, result)
-        team_elos[home] = new_home_elo - HOME_ADVANTAGE
-        team_elos[away] = new_away_elo
-
-        # Record Elo for this team
-        team_elo = team_elos[team_name]
-        elo_history.append({
-            'round': round_num,
-            'elo_score': team_elo,
-            'is_forecast': False
-        })
-
-    return pd.DataFrame(elo_history)
-
 # -------------- Elo Analysis for All Teams ----------------
 def analyze_all_teams(team_df: pd.DataFrame) -> pd.DataFrame:
-    all_teams = sorted(set(team_df['home_team']) | set(team_df['away_team']))
-    all_records = []
-
-    for team in all_teams:
-        elo_df = analyze_team(team_df, team)
-        elo_df['team'] = team
-        all_records.append(elo_df)
-
-    full_df = pd.concat(all_records, ignore_index=True)
+    team_df = team_df.sort_values(by='round', kind='stable').reset_index(drop=True)
+    missing = team_df[['home_score', 'away_score']].isna().any(axis=1)
+    if missing.any():
+        rounds_missing = sorted(team_df.loc[missing, 'round'].unique().tolist())
+        raise ValueError(f"Missing home_score/away_score for {int(missing.sum())} match(es) in round(s) {rounds_missing}")
+    team_dtype = pd.CategoricalDtype(sorted(set(team_df['home_team']) | set(team_df['away_team'])))
+
+    # Shared categories give integer team codes that index straight into the Elo array
+    home_idx = team_df['home_team'].astype(team_dtype).cat.codes.to_numpy()
+    away_idx = team_df['away_team'].astype(team_dtype).cat.codes.to_numpy()
+    home_score = team_df['home_score'].to_numpy()
+    away_score = team_df['away_score'].to_numpy()
+    rounds = team_df['round'].to_numpy()
+
+    elos = np.full(len(team_dtype.categories), INITIAL_ELO, dtype=np.float64)
+    home_elo_after = np.empty(len(team_df), dtype=np.float64)
+    away_elo_after = np.empty(len(team_df), dtype=np.float64)
+
+    # Replay the season once in round order
+    run_elo(home_idx, away_idx, match_results(home_score, away_score), elos,
+            ELO_K_FACTOR, ELO_SCALING, HOME_ADVANTAGE, home_elo_after, away_elo_after)
+
+    # One snapshot per side of every match, grouped by team at the end
+    home_view = pd.DataFrame({
+        'round': rounds,
+        'elo_score': home_elo_after,
+        'is_forecast': False,
+        'team': team_df['home_team'].to_numpy()
+    })
+    away_view = pd.DataFrame({
+        'round': rounds,
+        'elo_score': away_elo_after,
+        'is_forecast': False,
+        'team': team_df['away_team'].to_numpy()
+    })
+
+    full_df = pd.concat([home_view, away_view], ignore_index=True)
+    full_df = full_df.sort_values(by=['team', 'round'], kind='stable').reset_index(drop=True)
     full_df.to_csv("outputs/elo_history_all.csv", index=False)
 
     return full_df
@@ -73,15 +55,17 @@ def analyze_all_teams(team_df: pd.DataFrame) -> pd.DataFrame:
 class WinRateForecast:
     """This class does not compute Elo; it assumes current Elo ratings are preloaded."""
     def __init__(self, schedule_df: pd.DataFrame, team_elos: dict):
-        self.schedule_df = schedule_df
+        # Sort once so every per-team lookup is a plain positional slice
+        self.schedule_df = schedule_df.sort_values(by='round', kind='stable').reset_index(drop=True)
         self.team_elos = team_elos.copy()
+        self._elo_lookup = pd.Series(self.team_elos, dtype=np.float64)
+        self._home_arr = self.schedule_df['home_team'].to_numpy()
+        self._away_arr = self.schedule_df['away_team'].to_numpy()
 
     def forecast(self, team_name: str) -> pd.DataFrame:
         """Forecast next two rounds for a given team."""
-        future_matches = self.schedule_df[
-            (self.schedule_df['home_team'] == team_name) |
-            (self.schedule_df['away_team'] == team_name)
-        ].sort_values(by='round')
+        match_idx = np.flatnonzero((self._home_arr == team_name) | (self._away_arr == team_name))
+        future_matches = self.schedule_df.iloc[match_idx]
 
         if future_matches.empty:
             return pd.DataFrame()
@@ -90,54 +74,34 @@ class WinRateForecast:
         target_rounds = [current_round, current_round + 1]
         future_matches = future_matches[future_matches['round'].isin(target_rounds)]
 
-        forecast_rows = []
+        home_teams = future_matches['home_team'].to_numpy()
+        away_teams = future_matches['away_team'].to_numpy()
 
-        for _, row in future_matches.iterrows():
-            home = row['home_team']
-            away = row['away_team']
-            round_num = row['round']
+        home_elos = self._elo_lookup.loc[home_teams].to_numpy()
+        away_elos = self._elo_lookup.loc[away_teams].to_numpy()
 
-            home_elo = self.team_elos[home] + HOME_ADVANTAGE
-            away_elo = self.team_elos[away]
+        prob = win_probability(home_elos + HOME_ADVANTAGE, away_elos)
+        is_home = home_teams == team_name
+        target_prob = np.round(np.where(is_home, prob, 1 - prob) * 100).astype(int)
 
-            prob = win_probability(home_elo, away_elo)
-
-            if team_name == home:
-                target_prob = round(prob * 100)
-                opponent = away
-            else:
-                target_prob = round((1 - prob) * 100)
-                opponent = home
-
-            forecast_rows.append({
-                'round': round_num,
-                'team': team_name,
-                'opponent': opponent,
-                'win_probability': f"{target_prob}%",
-                'opponent_win_probability': f"{100 - target_prob}%"
-            })
-
-        return pd.DataFrame(forecast_rows)
+        return pd.DataFrame({
+            'round': future_matches['round'].to_numpy(),
+            'team': team_name,
+            'opponent': np.where(is_home, away_teams, home_teams),
+            'win_probability': pd.Series(target_prob).astype(str) + '%',
+            'opponent_win_probability': pd.Series(100 - target_prob).astype(str) + '%'
+        })
 
 # ------------- Forecast All Matches ---------------
 def forecast_all_matches(schedule_df: pd.DataFrame, elo_history_df: pd.DataFrame) -> pd.DataFrame:
     """Forecast next two rounds for all matches."""
-    teams_in_schedule = sorted(set(schedule_df['home_team']) | set(schedule_df['away_team']))
-
-    # Get most recent Elo for each team
-    team_elos = {}
-    for team in teams_in_schedule:
-        team_df = elo_history_df[
-            (elo_history_df['team'] == team) &
-            (elo_history_df['is_forecast'] == False)
-        ]
-        if not team_df.empty:
-            last_round = team_df['round'].max()
-            last_elo = team_df[team_df['round'] == last_round]['elo_score'].values[0]
-            team_elos[team] = last_elo
-        else:
-            # For teams without Elo history (e.g., newly promoted clubs), use INITIAL_ELO as fallback
-            team_elos[team] = INITIAL_ELO
+    # Get most recent Elo for each team in one sort instead of a scan per team
+    latest_elo = (
+        elo_history_df[~elo_history_df['is_forecast']]
+        .sort_values(by='round', kind='stable')
+        .drop_duplicates(subset='team', keep='last')
+        .set_index('team')['elo_score']
+    )
 
     # Forecast matches in next two rounds
     current_round = schedule_df['round'].min()
@@ -145,38 +109,31 @@ def forecast_all_matches(schedule_df: pd.DataFrame, elo_history_df: pd.DataFrame
     matches = schedule_df[schedule_df['round'].isin(target_rounds)].copy()
     matches.sort_values(by=['round', 'date'], inplace=True)
 
-    rows = []
-    for _, row in matches.iterrows():
-        home = row['home_team']
-        away = row['away_team']
-        round_num = row['round']
-        date = row['date']
-
-        home_elo = team_elos.get(home, INITIAL_ELO) + HOME_ADVANTAGE
-        away_elo = team_elos.get(away, INITIAL_ELO)
-
-        prob_home = round(win_probability(home_elo, away_elo) * 100)
-        prob_away = 100 - prob_home
-
-        for team in [home, away]:
-            opponent = away if team == home else home
-            win_prob = prob_home if team == home else prob_away
-            lose_prob = 100 - win_prob
-
-            rows.append({
-                'date': date,
-                'round': round_num,
-                'home_team': home,
-                'away_team': away,
-                'home_win_probability': f"{prob_home}%",
-                'away_win_probability': f"{prob_away}%",
-                'team': team,
-                'opponent': opponent,
-                'win_probability': f"{win_prob}%",
-                'opponent_win_probability': f"{lose_prob}%"
-            })
-
-    forecast_df = pd.DataFrame(rows)
+    # For teams without Elo history (e.g., newly promoted clubs), use INITIAL_ELO as fallback
+    team_dtype = pd.CategoricalDtype(sorted(set(schedule_df['home_team']) | set(schedule_df['away_team'])))
+    elos = latest_elo.reindex(team_dtype.categories, fill_value=INITIAL_ELO).to_numpy(dtype=np.float64)
+    home_elos = elos[matches['home_team'].astype(team_dtype).cat.codes.to_numpy()]
+    away_elos = elos[matches['away_team'].astype(team_dtype).cat.codes.to_numpy()]
+    prob_home_arr = np.round(win_probability(home_elos + HOME_ADVANTAGE, away_elos) * 100).astype(int)
+
+    base = matches[['date', 'round', 'home_team', 'away_team']].reset_index(drop=True)
+    base['home_win_probability'] = pd.Series(prob_home_arr).astype(str) + '%'
+    base['away_win_probability'] = pd.Series(100 - prob_home_arr).astype(str) + '%'
+
+    # One row per team and match: home view and away view, interleaved per match
+    home_view = base.assign(
+        team=base['home_team'],
+        opponent=base['away_team'],
+        win_probability=base['home_win_probability'],
+        opponent_win_probability=base['away_win_probability']
+    )
+    away_view = base.assign(
+        team=base['away_team'],
+        opponent=base['home_team'],
+        win_probability=base['away_win_probability'],
+        opponent_win_probability=base['home_win_probability']
+    )
+    forecast_df = pd.concat([home_view, away_view]).sort_index(kind='stable').reset_index(drop=True)
     forecast_df.to_csv("outputs/win_probability_forecast.csv", index=False)
 
     return forecast_df
\ No newline at end of file
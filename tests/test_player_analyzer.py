@@ -1,6 +1,7 @@
+import warnings
 import pandas as pd
 import numpy as np
-from player_analyzer import ForwardScorer
+from player_analyzer import ForwardScorer, POSITION_SCHEMA, save_top_players_to_csv
 
 dummy_df = pd.DataFrame({"fake": [1, 2, 3]})
 
@@ -34,4 +35,53 @@ def test_smart_scale_with_outliers():
     log_scaled = np.log1p(df["x"])
     expected = scorer.normalize(log_scaled)
     actual = result_df["x_norm"]
-    pd.testing.assert_series_equal(actual, expected, check_names=False)
\ No newline at end of file
+    pd.testing.assert_series_equal(actual, expected, check_names=False)
+
+def test_smart_scale_many_matches_smart_scale():
+    df = pd.DataFrame({"x": [10, 20, 30, 40, 50], "y": [10, 20, 30, 40, 1000]})
+    scorer = ForwardScorer(df.copy())
+    result_df = scorer.smart_scale_many(df.copy(), ["x", "y"])
+    for col in ["x", "y"]:
+        expected = scorer.smart_scale(df.copy(), col)[f"{col}_norm"]
+        pd.testing.assert_series_equal(result_df[f"{col}_norm"], expected)
+
+def test_compute_weighted_score():
+    df = pd.DataFrame({"a_norm": [0.0, 0.5, 1.0], "b_norm": [1.0, 0.5, 0.0]})
+    scorer = ForwardScorer(df.copy())
+    result_df = scorer.compute_weighted_score(df.copy(), {"a_norm": 0.75, "b_norm": -0.25})
+    expected = pd.Series([-0.25, 0.25, 0.75], name="score")
+    pd.testing.assert_series_equal(result_df["score"], expected)
+
+def test_top_n_returns_highest_scores_in_order():
+    scorer = ForwardScorer(dummy_df)
+    scorer.filtered_df = pd.DataFrame({"player": list("abcdef"), "score": [0.3, 0.9, 0.1, 0.7, 0.5, 0.8]})
+    result = scorer.top_n(3)
+    assert result["player"].tolist() == ["b", "f", "d"]
+
+def test_smart_scale_many_float32_matches_float64():
+    df = pd.DataFrame({"x": [0.1, 0.25, 0.3, 0.42, 0.5], "y": [1.5, 2.0, 2.5, 3.0, 40.0]})
+    scorer = ForwardScorer(df.copy())
+    expected = scorer.smart_scale_many(df.copy(), ["x", "y"])
+    result = scorer.smart_scale_many(df.astype(np.float32), ["x", "y"])
+    assert result["x_norm"].dtype == np.float32
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False, check_exact=False, rtol=1e-5)
+
+def test_save_top_players_writes_empty_ranking_for_missing_position(tmp_path):
+    metrics = sorted(set().union(*(spec["scorer_cls"].columns_to_scale for spec in POSITION_SCHEMA.values())))
+    df = pd.DataFrame(np.random.default_rng(0).random((6, len(metrics))), columns=metrics)
+    df["player"] = list("abcdef")
+    df["main_pos"] = ["FW"] * 3 + ["MF"] * 3
+    df["playing_time_min"] = 900.0
+    save_top_players_to_csv(df, output_dir=str(tmp_path))
+    assert pd.read_csv(tmp_path / "all_df_players.csv").empty
+    assert len(pd.read_csv(tmp_path / "all_fw_players.csv")) == 3
+
+def test_filtered_players_can_be_scaled_without_copy_warning():
+    df = pd.DataFrame({"playing_time_min": [100, 900, 1000, 1200, 1500], "x": [1.0, 2.0, 3.0, 4.0, 5.0]})
+    scorer = ForwardScorer(df)
+    scorer.filter_players()
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        result_df = scorer.smart_scale(scorer.filtered_df, "x")
+        result_df = scorer.compute_weighted_score(result_df, {"x_norm": 1.0})
+    assert result_df["score"].tolist() == [0.0, 0.5, 1.0]
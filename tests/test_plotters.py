@@ -0,0 +1,29 @@
+import pandas as pd
+from plotters import plot_elo_trends_parallel
+
+elo_df = pd.DataFrame({
+    "round": [1, 2, 1, 2],
+    "elo_score": [1510.0, 1520.0, 1490.0, 1480.0],
+    "is_forecast": False,
+    "team": ["A FC", "A FC", "B FC", "B FC"]
+})
+
+forecast_df = pd.DataFrame({
+    "date": ["2025-08-16", "2025-08-16"],
+    "round": [1, 1],
+    "home_team": ["A FC", "A FC"],
+    "away_team": ["B FC", "B FC"],
+    "home_win_probability": ["64%", "64%"],
+    "away_win_probability": ["36%", "36%"],
+    "team": ["A FC", "B FC"],
+    "opponent": ["B FC", "A FC"],
+    "win_probability": ["64%", "36%"],
+    "opponent_win_probability": ["36%", "64%"]
+})
+
+def test_plot_elo_trends_parallel_writes_every_team(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "outputs").mkdir()
+    plot_elo_trends_parallel(["A FC", "B FC"], elo_df, forecast_df, dpi=50, max_workers=2)
+    assert (tmp_path / "outputs" / "A_FC_elo_trend.png").exists()
+    assert (tmp_path / "outputs" / "B_FC_elo_trend.png").exists()
@@ -0,0 +1,98 @@
+import pandas as pd
+import pytest
+from team_analyzer import WinRateForecast, analyze_all_teams, forecast_all_matches
+from utils import update_elo, win_probability
+
+# Deliberately out of round order to check the chronological sort
+matches_df = pd.DataFrame({
+    "date": ["2024-08-24", "2024-08-17", "2024-08-31", "2024-09-14"],
+    "round": [2, 1, 3, 4],
+    "home_team": ["B", "A", "C", "A"],
+    "away_team": ["C", "B", "A", "C"],
+    "home_score": [1, 2, 0, 1],
+    "away_score": [1, 0, 3, 1]
+})
+
+schedule_df = pd.DataFrame({
+    "date": ["2025-08-16", "2025-08-16", "2025-08-23", "2025-08-30"],
+    "round": [1, 1, 2, 3],
+    "home_team": ["A", "D", "C", "B"],
+    "away_team": ["B", "C", "A", "D"]
+})
+
+@pytest.fixture(autouse=True)
+def outputs_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "outputs").mkdir()
+
+def test_analyze_all_teams_ratings():
+    # Every match updates both sides from their season-wide ratings
+    a, b = update_elo(1600, 1500, 1)                 # R1: A 2-0 B
+    a, b = a - 100, b
+    b, c = update_elo(b + 100, 1500, 0.5)            # R2: B 1-1 C
+    b = b - 100
+    c, a = update_elo(c + 100, a, 0)                 # R3: C 0-3 A
+    c = c - 100
+    a, c = update_elo(a + 100, c, 0.5)               # R4: A 1-1 C
+    a = a - 100
+
+    result = analyze_all_teams(matches_df)
+    history = result.set_index(["team", "round"])["elo_score"]
+    assert history[("A", 4)] == pytest.approx(a)
+    assert history[("B", 2)] == pytest.approx(b)
+    assert history[("C", 4)] == pytest.approx(c)
+
+def test_analyze_all_teams_layout():
+    result = analyze_all_teams(matches_df)
+    assert list(result.columns) == ["round", "elo_score", "is_forecast", "team"]
+    assert list(zip(result["team"], result["round"])) == [
+        ("A", 1), ("A", 3), ("A", 4),
+        ("B", 1), ("B", 2),
+        ("C", 2), ("C", 3), ("C", 4)
+    ]
+    assert not result["is_forecast"].any()
+
+def test_analyze_all_teams_rejects_missing_scores():
+    unplayed = matches_df.assign(home_score=[1, 2, None, 1])
+    with pytest.raises(ValueError, match=r"round\(s\) \[3\]"):
+        analyze_all_teams(unplayed)
+
+def test_forecast_all_matches_interleaves_home_and_away_rows():
+    history = analyze_all_teams(matches_df)
+    result = forecast_all_matches(schedule_df, history)
+    latest = history.groupby("team")["elo_score"].last()
+
+    # Only rounds 1 and 2; one home row then one away row per match
+    assert list(zip(result["round"], result["team"], result["opponent"])) == [
+        (1, "A", "B"), (1, "B", "A"),
+        (1, "D", "C"), (1, "C", "D"),
+        (2, "C", "A"), (2, "A", "C")
+    ]
+
+    # D has no history and starts from INITIAL_ELO
+    prob_home = round(win_probability(1500 + 100, latest["C"]) * 100)
+    d_home = result.iloc[2]
+    assert d_home["home_win_probability"] == f"{prob_home}%"
+    assert d_home["win_probability"] == f"{prob_home}%"
+    assert result.iloc[3]["win_probability"] == f"{100 - prob_home}%"
+    assert result.iloc[3]["opponent_win_probability"] == f"{prob_home}%"
+
+def test_win_rate_forecast_next_two_rounds():
+    team_elos = {"A": 1550.0, "B": 1500.0, "C": 1450.0, "D": 1500.0}
+    result = WinRateForecast(schedule_df, team_elos).forecast("A")
+
+    # Round 3 is outside the two-round window
+    assert list(zip(result["round"], result["team"], result["opponent"])) == [
+        (1, "A", "B"), (2, "A", "C")
+    ]
+
+    home_prob = round(win_probability(1550 + 100, 1500) * 100)
+    assert result.iloc[0]["win_probability"] == f"{home_prob}%"
+    assert result.iloc[0]["opponent_win_probability"] == f"{100 - home_prob}%"
+
+    away_prob = round((1 - win_probability(1450 + 100, 1550)) * 100)
+    assert result.iloc[1]["win_probability"] == f"{away_prob}%"
+    assert result.iloc[1]["opponent_win_probability"] == f"{100 - away_prob}%"
+
+def test_win_rate_forecast_unknown_team():
+    assert WinRateForecast(schedule_df, {"A": 1500.0}).forecast("Z").empty
@@ -0,0 +1,56 @@
+import sys
+import numpy as np
+import pytest
+import utils_numba
+from utils_numba import match_results, run_elo
+from utils import update_elo
+
+home_idx = np.array([0, 1, 2, 0])
+away_idx = np.array([1, 2, 0, 2])
+home_score = np.array([2, 1, 0, 3])
+away_score = np.array([0, 1, 1, 3])
+
+def expected_ratings():
+    elos = [1500.0, 1500.0, 1500.0]
+    out_home, out_away = [], []
+    for home, away, hs, as_ in zip(home_idx, away_idx, home_score, away_score):
+        result = 1 if hs > as_ else (0.5 if hs == as_ else 0)
+        new_home, new_away = update_elo(elos[home] + 100, elos[away], result)
+        elos[home] = new_home - 100
+        elos[away] = new_away
+        out_home.append(elos[home])
+        out_away.append(elos[away])
+    return elos, out_home, out_away
+
+def replay():
+    elos = np.full(3, 1500.0)
+    out_home = np.empty(4)
+    out_away = np.empty(4)
+    run_elo(home_idx, away_idx, match_results(home_score, away_score), elos,
+            32, 300, 100, out_home, out_away)
+    return elos, out_home, out_away
+
+def test_match_results():
+    result = match_results(np.array([2, 1, 0]), np.array([0, 1, 3]))
+    np.testing.assert_array_equal(result, [1.0, 0.5, 0.0])
+
+def test_run_elo_matches_update_elo():
+    for actual, expected in zip(replay(), expected_ratings()):
+        np.testing.assert_allclose(actual, expected, rtol=1e-12)
+
+def test_run_elo_jit_path_matches_update_elo(monkeypatch):
+    pytest.importorskip("numba")
+    monkeypatch.setattr(utils_numba, "NUMBA_MIN_MATCHES", 0)
+    for actual, expected in zip(replay(), expected_ratings()):
+        np.testing.assert_allclose(actual, expected, rtol=1e-12)
+
+def test_run_elo_falls_back_without_numba(monkeypatch):
+    monkeypatch.setitem(sys.modules, "numba", None)
+    monkeypatch.setattr(utils_numba, "NUMBA_MIN_MATCHES", 0)
+    utils_numba._jit_kernel.cache_clear()
+    try:
+        assert utils_numba._jit_kernel() is None
+        for actual, expected in zip(replay(), expected_ratings()):
+            np.testing.assert_allclose(actual, expected, rtol=1e-12)
+    finally:
+        utils_numba._jit_kernel.cache_clear()
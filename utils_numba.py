@@ -0,0 +1,52 @@
+import math
+from functools import lru_cache
+import numpy as np
+
+# Importing numba and loading its JIT cache costs ~0.5 s per process, while the plain loop
+# runs at ~1.4 µs per match; numba only pays off for very long match lists.
+NUMBA_MIN_MATCHES = 500_000
+
+def match_results(home_score, away_score):
+    """Home team outcome per match without branching: sign(-1/0/+1) maps to 0/0.5/1."""
+    return 0.5 * (np.sign(home_score - away_score) + 1).astype(np.float64)
+
+def _run_elo_loop(home_idx, away_idx, results, elos, k, scaling, home_adv, out_home, out_away):
+    ln10_over_scaling = math.log(10) / scaling
+
+    for i in range(len(results)):
+        home = home_idx[i]
+        away = away_idx[i]
+        result = results[i]
+
+        # Same as utils.win_probability, with 10**x written as exp(x * ln10)
+        home_elo = elos[home] + home_adv
+        away_elo = elos[away]
+        expected_home = 1.0 / (1.0 + math.exp((away_elo - home_elo) * ln10_over_scaling))
+
+        elos[home] += k * (result - expected_home)
+        elos[away] += k * (expected_home - result)
+
+        out_home[i] = elos[home]
+        out_away[i] = elos[away]
+
+@lru_cache(maxsize=None)
+def _jit_kernel():
+    """JIT-compiled loop, or None when numba (optional) is not installed."""
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+    return njit(cache=True)(_run_elo_loop)
+
+def run_elo(home_idx, away_idx, results, elos, k, scaling, home_adv, out_home, out_away):
+    """
+    Replay a sorted list of matches, updating the Elo array in place.
+    Parameters:
+        home_idx, away_idx --integer team codes indexing into elos
+        results --outcome for the home team (1 = win, 0.5 = draw, 0 = loss), see match_results
+        out_home, out_away --filled with each side's Elo after the match
+    """
+    kernel = _jit_kernel() if len(results) >= NUMBA_MIN_MATCHES else None
+    if kernel is None:
+        kernel = _run_elo_loop
+    kernel(home_idx, away_idx, results, elos, k, scaling, home_adv, out_home, out_away)